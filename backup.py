@@ -0,0 +1,228 @@
+import asyncio
+import contextlib
+import gzip
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+
+from config import (DB_PATH, BACKUP_DIR, BACKUP_INTERVAL, BACKUP_KEEP, BACKUP_PAGES, BACKUP_SLEEP,
+                    BACKUP_MAX_RESTARTS)
+
+logger = logging.getLogger(__name__)
+
+# Коды возврата sqlite3_backup_step, при которых источник заблокирован писателем
+_SQLITE_BUSY = 5
+_SQLITE_LOCKED = 6
+
+# Пауза перед повтором шага, вернувшего BUSY/LOCKED, если BACKUP_SLEEP равен 0
+_BUSY_RETRY_SLEEP = 0.05
+
+# Не даёт плановой копии и снимку администратора работать одновременно
+_backup_lock = asyncio.Lock()
+
+
+class _BackupCancelled(Exception):
+    """Копирование прервано при остановке бота."""
+
+
+def _online_backup(src_path: str, dest_path: str, pages: int, sleep: float, stop: threading.Event) -> dict:
+    """Копирует базу данных через online backup API порциями по ``pages`` страниц.
+
+    В режиме WAL (его включает ``Database.init``) на всё время копирования
+    держится одна транзакция чтения: копия получается согласованным снимком,
+    записи других соединений её не перезапускают, а сами писатели не ждут
+    читателя. Между порциями поток засыпает на ``sleep`` секунд, чтобы не
+    отнимать у бота диск и не задерживать контрольные точки WAL дольше нужного.
+
+    В других режимах журнала транзакция чтения заблокировала бы писателей,
+    поэтому она берётся на каждый шаг отдельно, а каждая запись перезапускает
+    копирование; после ``BACKUP_MAX_RESTARTS`` перезапусков копирование прерывается
+    с ошибкой. Файл пишется во временный путь и атомарно переименовывается
+    после завершения; установленный ``stop`` прерывает копирование.
+    """
+    stats = {"pages": 0, "pages_copied": 0, "steps": 0, "lock_waits": 0, "lock_wait_seconds": 0.0,
+             "restarts": 0, "wal": False}
+    last_remaining = None
+    wait_started = None
+
+    def progress(status: int, remaining: int, total: int):
+        nonlocal last_remaining, wait_started
+        if stop.is_set():
+            raise _BackupCancelled()
+        now = time.monotonic()
+        stats["steps"] += 1
+        stats["pages"] = total
+        if status in (_SQLITE_BUSY, _SQLITE_LOCKED):
+            # Ожидание считается от первого занятого шага до следующего успешного
+            if wait_started is None:
+                wait_started = now
+                stats["lock_waits"] += 1
+            return
+        if wait_started is not None:
+            stats["lock_wait_seconds"] += now - wait_started
+            wait_started = None
+        # Запись в источник через другое соединение перезапускает копирование с первой страницы
+        if last_remaining is not None and remaining > last_remaining:
+            stats["restarts"] += 1
+            if stats["restarts"] > BACKUP_MAX_RESTARTS:
+                logger.warning(
+                    "Резервне копіювання перервано: %s перезапусків через запис у базу без WAL",
+                    stats["restarts"], extra={f"backup_{k}": v for k, v in stats.items()}
+                )
+                raise RuntimeError(
+                    f"копіювання перезапущено {stats['restarts']} разів; увімкніть WAL для бази даних"
+                )
+            last_remaining = total
+        stats["pages_copied"] += (total if last_remaining is None else last_remaining) - remaining
+        last_remaining = remaining
+        if remaining and sleep:
+            stop.wait(sleep)
+
+    tmp_path = dest_path + ".tmp"
+    started = time.monotonic()
+    src = sqlite3.connect(src_path, isolation_level=None)
+    try:
+        stats["wal"] = src.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+        if stats["wal"]:
+            src.execute("BEGIN")
+            src.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        # Занятость источника видна в progress как BUSY, а не прячется в busy_timeout
+        src.execute("PRAGMA busy_timeout = 0")
+        dst = sqlite3.connect(tmp_path)
+        try:
+            src.backup(dst, pages=pages, progress=progress, sleep=sleep or _BUSY_RETRY_SLEEP)
+            # Копия должна быть одним файлом, без -wal/-shm рядом
+            dst.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            dst.close()
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+    finally:
+        src.close()
+    os.replace(tmp_path, dest_path)
+
+    duration = time.monotonic() - started
+    stats["duration"] = duration
+    stats["pages_per_second"] = stats["pages_copied"] / duration if duration else 0.0
+    stats["bytes"] = os.path.getsize(dest_path)
+    return stats
+
+
+def _compress(src_path: str, dest_path: str, stop: threading.Event):
+    """Потоково сжимает файл в gzip, не загружая его в память целиком."""
+    with open(src_path, "rb") as src, gzip.open(dest_path, "wb") as dst:
+        while chunk := src.read(1024 * 1024):
+            if stop.is_set():
+                raise _BackupCancelled()
+            dst.write(chunk)
+
+
+def _rotate(directory: str, keep: int):
+    """Удаляет старые плановые копии, оставляя ``keep`` последних."""
+    if keep <= 0:
+        return
+    backups = sorted(f for f in os.listdir(directory) if f.startswith("bot-") and f.endswith(".db"))
+    for name in backups[:-keep]:
+        os.remove(os.path.join(directory, name))
+
+
+def _next_backup_delay(directory: str, interval: float) -> float:
+    """Считает, сколько ждать до плановой копии, по времени последней из них."""
+    if not os.path.isdir(directory):
+        return 0.0
+    mtimes = [os.path.getmtime(os.path.join(directory, f)) for f in os.listdir(directory)
+              if f.startswith("bot-") and f.endswith(".db")]
+    if not mtimes:
+        return 0.0
+    return max(0.0, interval - (time.time() - max(mtimes)))
+
+
+async def _run_in_thread(func, *args):
+    """Выполняет ``func(*args, stop)`` в потоке и дожидается его при отмене.
+
+    Отмена задачи не останавливает поток ``asyncio.to_thread``, поэтому при
+    ней устанавливается ``stop`` и поток успевает прерваться и удалить
+    временные файлы до того, как отмена пойдёт дальше.
+    """
+    stop = threading.Event()
+    task = asyncio.ensure_future(asyncio.to_thread(func, *args, stop))
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        stop.set()
+        with contextlib.suppress(_BackupCancelled):
+            await task
+        raise
+
+
+def _log_stats(kind: str, path: str, stats: dict):
+    logger.info(
+        "Резервну копію (%s) створено за %.2f с: скопійовано %s сторінок, %.0f сторінок/с, "
+        "очікувань блокування %s (%.2f с), перезапусків %s",
+        kind, stats["duration"], stats["pages_copied"], stats["pages_per_second"], stats["lock_waits"],
+        stats["lock_wait_seconds"], stats["restarts"],
+        extra={"backup_kind": kind, "path": path, **{f"backup_{k}": v for k, v in stats.items()}}
+    )
+
+
+async def create_backup(dest_path: Optional[str] = None) -> Tuple[str, dict]:
+    """Создаёт резервную копию базы данных в фоновом потоке.
+
+    Возвращает путь к файлу копии и статистику копирования.
+    """
+    if dest_path is None:
+        os.makedirs(BACKUP_DIR, exist_ok=True)
+        dest_path = os.path.join(BACKUP_DIR, f"bot-{datetime.now():%Y%m%d-%H%M%S}.db")
+    async with _backup_lock:
+        stats = await _run_in_thread(_online_backup, DB_PATH, dest_path, BACKUP_PAGES, BACKUP_SLEEP)
+    _log_stats("scheduled", dest_path, stats)
+    return dest_path, stats
+
+
+async def create_snapshot() -> Tuple[str, dict]:
+    """Создаёт сжатый снимок базы данных для отправки администратору.
+
+    Возвращает уникальный путь к файлу ``.db.gz`` и статистику копирования;
+    файл удаляет вызывающий код после отправки.
+    """
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    fd, gz_path = tempfile.mkstemp(dir=BACKUP_DIR, prefix="snapshot-", suffix=".db.gz")
+    os.close(fd)
+    raw_path = gz_path[:-len(".gz")]
+    async with _backup_lock:
+        try:
+            stats = await _run_in_thread(_online_backup, DB_PATH, raw_path, BACKUP_PAGES, BACKUP_SLEEP)
+            await _run_in_thread(_compress, raw_path, gz_path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(gz_path)
+            raise
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(raw_path)
+    stats["compressed_bytes"] = os.path.getsize(gz_path)
+    _log_stats("snapshot", gz_path, stats)
+    return gz_path, stats
+
+
+async def backup_loop(interval: float = BACKUP_INTERVAL):
+    """Периодически создаёт резервные копии базы данных.
+
+    Первая копия делается сразу, если последняя плановая копия старше
+    ``interval``, так что частые перезапуски бота не откладывают её.
+    """
+    await asyncio.sleep(_next_backup_delay(BACKUP_DIR, interval))
+    while True:
+        try:
+            await create_backup()
+            await asyncio.to_thread(_rotate, BACKUP_DIR, BACKUP_KEEP)
+        except Exception as e:
+            logger.error("Помилка резервного копіювання бази даних: %s", e, exc_info=True)
+        await asyncio.sleep(interval)
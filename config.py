@@ -15,5 +15,25 @@ DB_PATH = os.getenv("DB_PATH", "bot.db")
 PAGE_SIZE = int(os.getenv("PAGE_SIZE", "10"))
 MAX_MESSAGE_LENGTH = 4096
 MAX_SEARCH_LENGTH = 100
+MAX_DOCUMENT_SIZE = 50 * 1024 * 1024  # лимит Bot API на отправку файла
+DOCUMENT_UPLOAD_TIMEOUT = 300  # секунд на отправку файла до 50 МБ
 
-ALLOWED_ROLES = ["Студент", "Абітурієнт", "Викладач", "Батько"]
\ No newline at end of file
+ALLOWED_ROLES = ["Студент", "Абітурієнт", "Викладач", "Батько"]
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Не более LOG_SAMPLE_LIMIT одинаковых записей за LOG_SAMPLE_WINDOW секунд
+LOG_SAMPLE_LIMIT = int(os.getenv("LOG_SAMPLE_LIMIT", "20"))
+LOG_SAMPLE_WINDOW = float(os.getenv("LOG_SAMPLE_WINDOW", "10"))
+# Сэмплируются только записи этого уровня и выше
+LOG_SAMPLE_LEVEL = os.getenv("LOG_SAMPLE_LEVEL", "WARNING")
+
+BACKUP_DIR = os.getenv("BACKUP_DIR", "backups")
+# Интервал плановых копий в секундах; 0 отключает их
+BACKUP_INTERVAL = float(os.getenv("BACKUP_INTERVAL", "86400"))
+BACKUP_KEEP = int(os.getenv("BACKUP_KEEP", "7"))
+# Страниц за один шаг backup API и пауза между шагами в секундах
+BACKUP_PAGES = int(os.getenv("BACKUP_PAGES", "256"))
+BACKUP_SLEEP = float(os.getenv("BACKUP_SLEEP", "0.05"))
+# Сколько перезапусков копирования допустимо, если база не в режиме WAL
+BACKUP_MAX_RESTARTS = int(os.getenv("BACKUP_MAX_RESTARTS", "3"))
@@ -17,6 +17,8 @@ class Database:
         """Инициализирует базу данных, создавая таблицы и настройки по умолчанию."""
         try:
             async with aiosqlite.connect(self.db_path) as db:
+                # WAL: фоновая резервная копия читает снимок, не блокируя запись
+                await db.execute("PRAGMA journal_mode=WAL")
                 await db.execute("""
                 CREATE TABLE IF NOT EXISTS users (
                     id INTEGER PRIMARY KEY,
@@ -56,7 +58,7 @@ class Database:
                 await db.commit()
                 logger.info("База даних успішно ініціалізована.")
         except Exception as e:
-            logger.error(f"Помилка ініціалізації бази даних: {e}")
+            logger.error("Помилка ініціалізації бази даних: %s", e)
             raise
 
     async def add_user(self, user_id: int, username: str, full_name: str) -> bool:
@@ -74,7 +76,7 @@ class Database:
                 await db.commit()
                 return True
         except Exception as e:
-            logger.error(f"Помилка додавання користувача {user_id}: {e}")
+            logger.error("Помилка додавання користувача %s: %s", user_id, e, extra={"user_id": user_id})
             return False
 
     async def set_role(self, user_id: int, role: Optional[str]) -> bool:
@@ -87,7 +89,7 @@ class Database:
                 await db.commit()
                 return True
         except Exception as e:
-            logger.error(f"Помилка встановлення ролі для {user_id}: {e}")
+            logger.error("Помилка встановлення ролі для %s: %s", user_id, e, extra={"user_id": user_id})
             return False
 
     async def get_users(self, offset: int = 0, limit: int = PAGE_SIZE,
@@ -109,7 +111,7 @@ class Database:
                     )
                 return await cur.fetchall()
         except Exception as e:
-            logger.error(f"Помилка отримання користувачів: {e}")
+            logger.error("Помилка отримання користувачів: %s", e)
             return []
 
     async def get_users_count(self, role: Optional[str] = None) -> int:
@@ -123,7 +125,7 @@ class Database:
                 row = await cur.fetchone()
                 return row[0] if row else 0
         except Exception as e:
-            logger.error(f"Помилка підрахунку користувачів: {e}")
+            logger.error("Помилка підрахунку користувачів: %s", e)
             return 0
 
     async def search_users(self, query: str) -> List[Tuple]:
@@ -143,7 +145,7 @@ class Database:
                     )
                 return await cur.fetchall()
         except Exception as e:
-            logger.error(f"Помилка пошуку користувачів: {e}")
+            logger.error("Помилка пошуку користувачів: %s", e)
             return []
 
     async def get_roles_stats(self) -> dict:
@@ -159,7 +161,7 @@ class Database:
                 stats["all"] = (await cur.fetchone())[0]
                 return stats
         except Exception as e:
-            logger.error(f"Помилка отримання статистики ролі: {e}")
+            logger.error("Помилка отримання статистики ролі: %s", e)
             return {role: 0 for role in ALLOWED_ROLES + ["all"]}
 
     async def get_setting(self, key: str) -> Optional[str]:
@@ -170,7 +172,7 @@ class Database:
                 row = await cur.fetchone()
                 return row[0] if row else None
         except Exception as e:
-            logger.error(f"Помилка отримання налаштувань {key}: {e}")
+            logger.error("Помилка отримання налаштувань %s: %s", key, e)
             return None
 
     async def set_setting(self, key: str, value: str) -> bool:
@@ -184,7 +186,7 @@ class Database:
                 await db.commit()
                 return True
         except Exception as e:
-            logger.error(f"Помилка налаштування {key}: {e}")
+            logger.error("Помилка налаштування %s: %s", key, e)
             return False
 
     async def get_users_for_broadcast(self, role: Optional[str] = None) -> List[int]:
@@ -198,7 +200,7 @@ class Database:
                 rows = await cur.fetchall()
                 return [row[0] for row in rows]
         except Exception as e:
-            logger.error(f"Помилка отримання користувачів для трансляції: {e}")
+            logger.error("Помилка отримання користувачів для трансляції: %s", e)
             return []
 
     async def save_broadcast(self, admin_id: int, role_filter: str, message: str, recipients_count: int):
@@ -211,4 +213,4 @@ class Database:
                 """, (admin_id, role_filter, message, recipients_count, datetime.now()))
                 await db.commit()
         except Exception as e:
-            logger.error(f"Помилка збереження історії трансляцій: {e}")
\ No newline at end of file
+            logger.error("Помилка збереження історії трансляцій: %s", e)
\ No newline at end of file
@@ -1,13 +1,15 @@
 import asyncio
 import logging
+import os
 from aiogram import Router, types, F
 from aiogram.filters import Command
-from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, FSInputFile
 from aiogram.fsm.context import FSMContext
-from aiogram.exceptions import TelegramBadRequest
+from aiogram.exceptions import TelegramAPIError, TelegramBadRequest
 
-from config import ADMINS, MAX_MESSAGE_LENGTH, ALLOWED_ROLES, PAGE_SIZE
+from config import ADMINS, MAX_MESSAGE_LENGTH, MAX_DOCUMENT_SIZE, DOCUMENT_UPLOAD_TIMEOUT, ALLOWED_ROLES, PAGE_SIZE
 from database import Database
+from backup import create_snapshot
 from states import SearchUser, EditWelcome, Broadcast
 from keyboards import get_admin_panel_kb, get_user_list_kb, get_broadcast_roles_kb
 
@@ -40,7 +42,8 @@ async def admin_panel(message: types.Message):
     text = await _get_admin_panel_text()
     keyboard = get_admin_panel_kb()
     await message.answer(text, reply_markup=keyboard)
-    logger.info(f"Адміністратор {message.from_user.id} відкрив панель адміністратора.")
+    logger.info("Адміністратор %s відкрив панель адміністратора.", message.from_user.id,
+                extra={"admin_id": message.from_user.id})
 
 
 @router.callback_query(F.data == "refresh_admin", F.from_user.id.in_(ADMINS))
@@ -237,10 +240,14 @@ async def confirm_broadcast(callback: types.CallbackQuery, state: FSMContext):
             await callback.bot.send_message(user_id, message_text, parse_mode='HTML')
             sent_count += 1
         except Exception as e:
-            logger.error(f"Не вдалося надіслати повідомлення користувачеві {user_id}: {e}")
+            logger.error("Не вдалося надіслати повідомлення користувачеві %s: %s", user_id, e,
+                         extra={"user_id": user_id, "error_type": type(e).__name__})
             failed_count += 1
 
     await db.save_broadcast(callback.from_user.id, role_filter, message_text, sent_count)
+    logger.info("Трансляцію завершено: надіслано %s, не вдалося %s", sent_count, failed_count,
+                extra={"admin_id": callback.from_user.id, "role_filter": role_filter,
+                       "sent": sent_count, "failed": failed_count})
 
     await callback.message.edit_text(
         f"✅ Трансляцію успішно надіслано!\n\n"
@@ -258,6 +265,43 @@ async def cancel_broadcast(callback: types.CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
+@router.callback_query(F.data == "db_snapshot", F.from_user.id.in_(ADMINS))
+async def send_db_snapshot(callback: types.CallbackQuery):
+    """Создаёт сжатый снимок базы данных и отправляет его администратору."""
+    await callback.answer("⏳ Створення резервної копії...")
+    try:
+        path, stats = await create_snapshot()
+    except Exception as e:
+        logger.error("Помилка створення знімка бази даних: %s", e, exc_info=True)
+        await callback.message.answer("❌ Не вдалося створити резервну копію.")
+        return
+
+    caption = (
+        f"💾 Резервна копія бази даних\n\n"
+        f"Тривалість: {stats['duration']:.2f} с\n"
+        f"Сторінок: {stats['pages']} ({stats['pages_per_second']:.0f}/с)\n"
+        f"Очікувань блокування: {stats['lock_waits']}\n"
+        f"Розмір: {stats['bytes'] // 1024} КБ → {stats['compressed_bytes'] // 1024} КБ"
+    )
+    size_mb = stats['compressed_bytes'] / (1024 * 1024)
+    try:
+        if stats['compressed_bytes'] > MAX_DOCUMENT_SIZE:
+            logger.error("Знімок бази даних завеликий для надсилання: %.1f МБ", size_mb,
+                         extra={"path": path, "compressed_bytes": stats['compressed_bytes']})
+            await callback.message.answer(
+                f"❌ Резервна копія завелика для надсилання ({size_mb:.1f} МБ, ліміт "
+                f"{MAX_DOCUMENT_SIZE // (1024 * 1024)} МБ)."
+            )
+            return
+        await callback.bot.send_document(callback.message.chat.id, FSInputFile(path), caption=caption,
+                                         request_timeout=DOCUMENT_UPLOAD_TIMEOUT)
+    except TelegramAPIError as e:
+        logger.error("Не вдалося надіслати знімок бази даних (%.1f МБ): %s", size_mb, e)
+        await callback.message.answer(f"❌ Не вдалося надіслати резервну копію ({size_mb:.1f} МБ).")
+    finally:
+        os.remove(path)
+
+
 @router.callback_query(F.data == "back_to_admin", F.from_user.id.in_(ADMINS))
 async def back_to_admin(callback: types.CallbackQuery, state: FSMContext):
     """Возврат в панель администратора из любого состояния."""
@@ -28,7 +28,8 @@ async def start_command(message: types.Message):
     ])
 
     await message.answer(welcome, reply_markup=keyboard)
-    logger.info(f"Новий користувач: {message.from_user.id} - {message.from_user.full_name}")
+    logger.info("Новий користувач: %s - %s", message.from_user.id, message.from_user.full_name,
+                extra={"user_id": message.from_user.id})
 
 @router.message(Command("help"))
 async def help_command(message: types.Message):
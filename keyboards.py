@@ -9,6 +9,7 @@ def get_admin_panel_kb() -> InlineKeyboardMarkup:
         [InlineKeyboardButton(text="👤 Керування користувачами", callback_data="manage_users:0:ALL")],
         [InlineKeyboardButton(text="🔍 Знайти користувача", callback_data="search_user")],
         [InlineKeyboardButton(text="📤 Надіслати розсилку", callback_data="broadcast")],
+        [InlineKeyboardButton(text="💾 Резервна копія бази", callback_data="db_snapshot")],
         [InlineKeyboardButton(text="🔄 Оновити", callback_data="refresh_admin")]
     ])
 
@@ -0,0 +1,215 @@
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Tuple
+
+from config import LOG_LEVEL, LOG_QUEUE_SIZE, LOG_SAMPLE_LEVEL, LOG_SAMPLE_LIMIT, LOG_SAMPLE_WINDOW
+
+# Стандартные атрибуты LogRecord; всё остальное пришло через extra=
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Форматирует записи журнала как одну JSON-строку."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Ограничивает количество одинаковых записей за окно времени.
+
+    Сэмплируются только записи уровня ``level`` и выше. Записи считаются
+    одинаковыми, если совпадают логгер, уровень, шаблон сообщения (до
+    подстановки аргументов) и тип ошибки из ``exc_info`` или поля
+    ``error_type``. Количество отброшенных записей
+    добавляется в поле ``suppressed`` первой записи следующего окна, а для
+    окон без продолжения его отдаёт ``collect_suppressed``.
+    """
+
+    def __init__(self, limit: int = LOG_SAMPLE_LIMIT, window: float = LOG_SAMPLE_WINDOW,
+                 level: str = LOG_SAMPLE_LEVEL):
+        super().__init__()
+        self.limit = limit
+        self.level = logging.getLevelName(level) if isinstance(level, str) else level
+        self.window = window
+        self._lock = threading.Lock()
+        # ключ -> [начало окна, пропущено в окне, отброшено в окне]
+        self._state: Dict[Tuple, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0 or record.levelno < self.level:
+            return True
+        msg = record.msg if isinstance(record.msg, str) else type(record.msg).__name__
+        error_type = getattr(record, "error_type", None)
+        if error_type is None and record.exc_info and record.exc_info[0]:
+            error_type = record.exc_info[0].__name__
+        key = (record.name, record.levelno, msg, error_type)
+        now = time.monotonic()
+        with self._lock:
+            state = self._state.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                self._state[key] = [now, 1, 0]
+                if len(self._state) > 1024:
+                    self._evict(now)
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if state[1] < self.limit:
+                state[1] += 1
+                return True
+            state[2] += 1
+            return False
+
+    def _evict(self, now: float):
+        """Удаляет устаревшие окна без отброшенных записей, чтобы словарь не рос бесконечно."""
+        for key in [k for k, s in self._state.items() if now - s[0] >= self.window and not s[2]]:
+            del self._state[key]
+
+    def collect_suppressed(self, force: bool = False) -> List[Tuple[Tuple, int]]:
+        """Забирает счётчики отброшенных записей из завершившихся окон.
+
+        При ``force`` забирает их и из текущих окон, например при остановке.
+        """
+        now = time.monotonic()
+        collected = []
+        with self._lock:
+            for key, state in list(self._state.items()):
+                if not (force or now - state[0] >= self.window):
+                    continue
+                if state[2]:
+                    collected.append((key, state[2]))
+                    state[2] = 0
+                if now - state[0] >= self.window:
+                    del self._state[key]
+        return collected
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler, который никогда не блокирует вызывающий поток.
+
+    Форматирование откладывается до фонового потока, а при переполнении
+    очереди запись отбрасывается; их количество добавляется в поле
+    ``dropped`` следующей записи, попавшей в очередь.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Аргументы форматирует уже JsonFormatter в потоке QueueListener
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.dropped:
+            record.dropped = self.dropped
+        try:
+            self.queue.put_nowait(record)
+            self.dropped = 0
+        except queue.Full:
+            self.dropped += 1
+
+    def collect_dropped(self) -> int:
+        """Забирает счётчик записей, отброшенных после последней успешной."""
+        self.acquire()
+        try:
+            dropped, self.dropped = self.dropped, 0
+        finally:
+            self.release()
+        return dropped
+
+
+class SummaryQueueListener(QueueListener):
+    """QueueListener, который периодически пишет сводки отброшенных записей.
+
+    Сводки о сэмплировании и переполнении очереди выводятся не реже раза в
+    ``interval`` секунд и при остановке, поэтому хвост всплеска ошибок не
+    теряется.
+    """
+
+    def __init__(self, log_queue: queue.Queue, queue_handler: NonBlockingQueueHandler,
+                 sampling_filter: SamplingFilter, *handlers: logging.Handler,
+                 interval: float = LOG_SAMPLE_WINDOW):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self.sampling_filter = sampling_filter
+        self.interval = interval
+        self._last_summary = time.monotonic()
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        while True:
+            if time.monotonic() - self._last_summary >= self.interval:
+                self._emit_summaries()
+            try:
+                return self.queue.get(block, timeout=self.interval if block else None)
+            except queue.Empty:
+                if not block:
+                    raise
+
+    def enqueue_sentinel(self):
+        # Очередь ограничена; поток слушателя освободит место для маркера
+        self.queue.put(self._sentinel)
+
+    def stop(self):
+        super().stop()
+        self._emit_summaries(force=True)
+
+    def _emit_summaries(self, force: bool = False):
+        self._last_summary = time.monotonic()
+        for (name, levelno, msg, error_type), count in self.sampling_filter.collect_suppressed(force):
+            self.handle(logging.getLogger(name).makeRecord(
+                name, levelno, "", 0, "Пропущено %s однакових записів: %s", (count, msg), None,
+                extra={"suppressed": count, "error_type": error_type}
+            ))
+        dropped = self.queue_handler.collect_dropped()
+        if dropped:
+            self.handle(logging.getLogger(__name__).makeRecord(
+                __name__, logging.WARNING, "", 0, "Відкинуто %s записів через переповнену чергу",
+                (dropped,), None, extra={"dropped": dropped}
+            ))
+
+
+def setup_logging(level: str = LOG_LEVEL) -> QueueListener:
+    """Настраивает корневой логгер на запись через очередь в фоновом потоке.
+
+    Возвращает запущенный QueueListener; его нужно остановить при завершении,
+    чтобы записать оставшиеся в очереди записи.
+    """
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(JsonFormatter())
+
+    sampling_filter = SamplingFilter()
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(sampling_filter)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = SummaryQueueListener(log_queue, queue_handler, sampling_filter, stream_handler)
+    listener.start()
+    return listener
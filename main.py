@@ -1,17 +1,18 @@
 import asyncio
+import contextlib
 import logging
 from aiogram import Bot, Dispatcher
 from aiogram.fsm.storage.memory import MemoryStorage
 from handlers import user_handlers, admin_handlers
 from database import Database
-from config import TOKEN, DB_PATH
+from config import TOKEN, DB_PATH, BACKUP_INTERVAL
+from backup import backup_loop
+from log_setup import setup_logging
 
 # Инициализация логирования
 logger = logging.getLogger(__name__)
 
 async def main():
-    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
     bot = Bot(token=TOKEN)
     dp = Dispatcher(storage=MemoryStorage())
     db = Database()
@@ -26,13 +27,25 @@ async def main():
     dp.include_router(user_handlers.router)
     dp.include_router(admin_handlers.router)
 
+    # Start scheduled backups
+    backup_task = asyncio.create_task(backup_loop()) if BACKUP_INTERVAL > 0 else None
+
     logger.info("Bot is starting...")
-    await dp.start_polling(bot)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        if backup_task:
+            backup_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await backup_task
 
 if __name__ == "__main__":
+    log_listener = setup_logging()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Bot stopped by user.")
     except Exception as e:
-        logger.critical(f"Critical error: {e}", exc_info=True)
\ No newline at end of file
+        logger.critical("Critical error: %s", e, exc_info=True)
+    finally:
+        log_listener.stop()